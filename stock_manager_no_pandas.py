@@ -77,7 +77,7 @@ def read_json():
 def write_json(data):
     try:
         with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+            json.dump(data, f, separators=(',', ':'))  # Compact: no indentation whitespace
         return True
     except Exception as e:
         st.error(f"Error writing to JSON: {e}")
@@ -285,8 +285,8 @@ def delete_stock():
             success = delete_stock_entry(index, st.session_state.entries)
             if success:
                 st.success("Stock entry deleted successfully!")
-                st.session_state.entries = get_stock_entries()
-                st.experimental_rerun()
+                # The list was updated in place, so repaint without re-reading the file
+                st.rerun()
             else:
                 st.error("Failed to delete stock entry.")
 
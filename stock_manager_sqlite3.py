@@ -4,200 +4,323 @@ import numpy as np
 import matplotlib.pyplot as plt
 import sqlite3
 from sqlite3 import Error
-from contextlib import contextmanager
+import io
+import threading
 
 # Constants
 DB_NAME = 'stocks.db'
+STATEMENT_CACHE_SIZE = 256  # sqlite3 defaults to 128 prepared statements per connection
+
+# SQL Statements
+# Kept as constants so every call hands sqlite3 the identical string and hits its statement cache.
+
+STOCK_COLUMNS = ['id', 'stock_symbol', 'total_shares', 'buy_price', 'risk_ratio', 'reward_ratio', 'sell_strategy', 'sell_price']
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS stocks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stock_symbol TEXT NOT NULL UNIQUE,
+    total_shares INTEGER NOT NULL,
+    buy_price REAL NOT NULL,
+    risk_ratio REAL NOT NULL,
+    reward_ratio REAL NOT NULL,
+    sell_strategy TEXT NOT NULL,
+    sell_price REAL
+);
+"""
+
+# Tables created before stock_symbol was declared UNIQUE have no index on it
+CREATE_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS idx_stocks_symbol ON stocks(stock_symbol);"
+
+# Metrics are derived from the stored columns, so SQLite computes them while reading rows
+CREATE_METRICS_VIEW_SQL = """
+CREATE VIEW IF NOT EXISTS stocks_with_metrics AS
+SELECT id, stock_symbol, total_shares, buy_price, risk_ratio, reward_ratio, sell_strategy, sell_price,
+    round(total_shares * buy_price, 2) AS total_investment,
+    round(buy_price * risk_ratio / 100.0, 2) AS risk_amount,
+    round(buy_price * reward_ratio / 100.0, 2) AS reward_amount,
+    round(buy_price - buy_price * risk_ratio / 100.0, 2) AS stop_loss_price,
+    round(buy_price + buy_price * reward_ratio / 100.0, 2) AS take_profit_price,
+    round(CASE sell_strategy
+        WHEN 'Risk-Based' THEN buy_price - buy_price * risk_ratio / 100.0
+        ELSE buy_price + buy_price * reward_ratio / 100.0
+    END, 2) AS adjusted_sell_price
+FROM stocks;
+"""
+
+# Display labels for the metric columns of stocks_with_metrics
+METRIC_COLUMNS = {
+    'total_investment': 'Total Investment ($)',
+    'risk_amount': 'Risk Amount ($)',
+    'reward_amount': 'Reward Amount ($)',
+    'stop_loss_price': 'Stop-Loss Price ($)',
+    'take_profit_price': 'Take-Profit Price ($)',
+    'adjusted_sell_price': 'Adjusted Sell Price ($)'
+}
+
+INSERT_SQL = """
+INSERT INTO stocks (stock_symbol, total_shares, buy_price, risk_ratio, reward_ratio, sell_strategy, sell_price)
+VALUES (?, ?, ?, ?, ?, ?, ?);
+"""
+
+UPDATE_SQL = """
+UPDATE stocks
+SET stock_symbol = ?,
+    total_shares = ?,
+    buy_price = ?,
+    risk_ratio = ?,
+    reward_ratio = ?,
+    sell_strategy = ?,
+    sell_price = ?
+WHERE id = ?;
+"""
+
+DELETE_SQL = "DELETE FROM stocks WHERE id = ?;"
+
+SELECT_ALL_SQL = f"SELECT {', '.join(STOCK_COLUMNS + list(METRIC_COLUMNS))} FROM stocks_with_metrics ORDER BY stock_symbol;"
+
+SELECT_SYMBOLS_SQL = "SELECT stock_symbol FROM stocks ORDER BY stock_symbol;"
+
+SELECT_BY_SYMBOL_SQL = f"SELECT {', '.join(STOCK_COLUMNS)} FROM stocks WHERE stock_symbol = ? LIMIT 1;"
+
+# Cheap change token; data_version also moves when another connection commits
+STOCKS_TOKEN_SQL = "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM stocks;"
+
+SQLITE_MAX_INTEGER = 2**63 - 1  # SQLite INTEGER is a signed 64-bit value
 
 # Database Helper Functions
 
-@contextmanager
-def get_db_connection(db_name=DB_NAME):
-    """Context manager for SQLite database connection."""
-    conn = None
-    try:
-        conn = sqlite3.connect(db_name)
-        conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key support
-        yield conn
-    except Error as e:
-        st.error(f"Database connection error: {e}")
-        yield None
-    finally:
-        if conn:
-            conn.close()
+@st.cache_resource
+def get_conn(db_name=DB_NAME):
+    """Return a long-lived SQLite connection shared across Streamlit reruns."""
+    conn = sqlite3.connect(db_name, check_same_thread=False, isolation_level=None,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row  # Rows support access by column name
+    conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key support
+    conn.execute("PRAGMA synchronous = NORMAL")  # Safe under WAL, avoids an fsync per commit
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -20000")  # ~20 MB page cache
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB memory-mapped I/O
+    return conn
+
+@st.cache_resource
+def get_conn_lock(db_name=DB_NAME):
+    """Return the lock serializing all use of the shared connection for db_name."""
+    # check_same_thread=False lets sessions share the connection, and with it any open
+    # transaction, so reads take the lock too: otherwise they could see another session's
+    # uncommitted batch. Cached like the connection: a module-level lock would be
+    # recreated on every rerun
+    return threading.Lock()
 
 def init_db():
     """Initialize the database and create tables if they don't exist."""
-    with get_db_connection() as conn:
-        if conn is not None:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS stocks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                stock_symbol TEXT NOT NULL UNIQUE,
-                total_shares INTEGER NOT NULL,
-                buy_price REAL NOT NULL,
-                risk_ratio REAL NOT NULL,
-                reward_ratio REAL NOT NULL,
-                sell_strategy TEXT NOT NULL,
-                sell_price REAL
-            );
-            """
-            try:
-                conn.execute(create_table_sql)
-            except Error as e:
-                st.error(f"Error creating table: {e}")
+    try:
+        conn = get_conn()
+        with get_conn_lock():
+            # journal_mode is persisted in the database file, so set it once here
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(CREATE_TABLE_SQL)
+            # The view first: the unique index fails on duplicate symbols, and the app keeps
+            # running in that case, so View Stocks must not depend on it
+            conn.execute(CREATE_METRICS_VIEW_SQL)
+            conn.execute(CREATE_INDEX_SQL)
+    except sqlite3.IntegrityError:
+        st.error("Duplicate stock symbols found in the database. Remove them so symbols can be indexed as unique.")
+    except Error as e:
+        st.error(f"Error creating table: {e}")
 
 def add_stock_entry(entry):
     """Add a new stock entry to the database."""
-    with get_db_connection() as conn:
-        if conn is not None:
-            insert_sql = """
-            INSERT INTO stocks (stock_symbol, total_shares, buy_price, risk_ratio, reward_ratio, sell_strategy, sell_price)
-            VALUES (?, ?, ?, ?, ?, ?, ?);
-            """
+    return add_stock_entries([entry])
+
+def add_stock_entries(entries):
+    """Add multiple stock entries to the database in a single transaction."""
+    params = [(
+        entry['stock_symbol'],
+        entry['total_shares'],
+        entry['buy_price'],
+        entry['risk_ratio'],
+        entry['reward_ratio'],
+        entry['sell_strategy'],
+        entry['sell_price']
+    ) for entry in entries]
+    try:
+        conn = get_conn()
+        with get_conn_lock():
+            conn.execute("BEGIN")
             try:
-                conn.execute(insert_sql, (
-                    entry['stock_symbol'],
-                    entry['total_shares'],
-                    entry['buy_price'],
-                    entry['risk_ratio'],
-                    entry['reward_ratio'],
-                    entry['sell_strategy'],
-                    entry['sell_price']
-                ))
+                conn.executemany(INSERT_SQL, params)
                 conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                st.error(f"Stock Symbol '{entry['stock_symbol']}' already exists. Please use a unique symbol.")
-                return False
-            except Error as e:
-                st.error(f"Error adding stock entry: {e}")
-                return False
+            finally:
+                # Any failure, not only sqlite3.Error (e.g. OverflowError binding a huge int), must not
+                # leave the shared connection inside an open transaction
+                if conn.in_transaction:
+                    conn.rollback()
+        _load_stocks.clear()
+        return True
+    except sqlite3.IntegrityError:
+        if len(entries) == 1:
+            st.error(f"Stock Symbol '{entries[0]['stock_symbol']}' already exists. Please use a unique symbol.")
         else:
-            st.error("Failed to connect to the database.")
-            return False
+            st.error("One or more Stock Symbols already exist or are repeated. Please use unique symbols.")
+        return False
+    except (Error, OverflowError) as e:
+        st.error(f"Error adding stock entry: {e}")
+        return False
+
+@st.cache_data
+def _load_stocks(token):
+    """Read the stocks table; the result is reused until the token changes.
+
+    Called by get_all_stocks with get_conn_lock() held.
+    """
+    # Money stays float64: float32 loses cents above ~$100k. An all-NULL sell_price
+    # would otherwise come back as an object column
+    return pd.read_sql_query(SELECT_ALL_SQL, get_conn(), dtype={'sell_price': 'float64'})
 
 def get_all_stocks():
-    """Retrieve all stock entries from the database."""
-    with get_db_connection() as conn:
-        stocks = []
-        if conn is not None:
-            select_sql = "SELECT * FROM stocks;"
-            try:
-                cursor = conn.execute(select_sql)
-                rows = cursor.fetchall()
-                for row in rows:
-                    stock = {
-                        'id': row[0],
-                        'stock_symbol': row[1],
-                        'total_shares': row[2],
-                        'buy_price': row[3],
-                        'risk_ratio': row[4],
-                        'reward_ratio': row[5],
-                        'sell_strategy': row[6],
-                        'sell_price': row[7]
-                    }
-                    stocks.append(stock)
-            except Error as e:
-                st.error(f"Error retrieving stocks: {e}")
-        else:
-            st.error("Failed to connect to the database.")
-        return stocks
+    """Retrieve all stock entries from the database as a DataFrame."""
+    try:
+        conn = get_conn()
+        with get_conn_lock():
+            token = tuple(conn.execute(STOCKS_TOKEN_SQL).fetchone())
+            token += tuple(conn.execute("PRAGMA data_version").fetchone())
+            return _load_stocks(token)
+    except (Error, pd.errors.DatabaseError) as e:
+        st.error(f"Error retrieving stocks: {e}")
+        return pd.DataFrame()
+
+def get_stock_symbols():
+    """Retrieve only the stock symbols from the database."""
+    try:
+        with get_conn_lock():
+            return [row['stock_symbol'] for row in get_conn().execute(SELECT_SYMBOLS_SQL)]
+    except Error as e:
+        st.error(f"Error retrieving stock symbols: {e}")
+        return []
+
+def get_stock_by_symbol(stock_symbol):
+    """Retrieve a single stock entry by its symbol, or None if it does not exist."""
+    try:
+        with get_conn_lock():
+            return get_conn().execute(SELECT_BY_SYMBOL_SQL, (stock_symbol,)).fetchone()
+    except Error as e:
+        st.error(f"Error retrieving stock entry: {e}")
+        return None
 
 def update_stock_entry(stock_id, updated_entry):
     """Update an existing stock entry in the database."""
-    with get_db_connection() as conn:
-        if conn is not None:
-            update_sql = """
-            UPDATE stocks
-            SET stock_symbol = ?,
-                total_shares = ?,
-                buy_price = ?,
-                risk_ratio = ?,
-                reward_ratio = ?,
-                sell_strategy = ?,
-                sell_price = ?
-            WHERE id = ?;
-            """
-            try:
-                conn.execute(update_sql, (
-                    updated_entry['stock_symbol'],
-                    updated_entry['total_shares'],
-                    updated_entry['buy_price'],
-                    updated_entry['risk_ratio'],
-                    updated_entry['reward_ratio'],
-                    updated_entry['sell_strategy'],
-                    updated_entry['sell_price'],
-                    stock_id
-                ))
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                st.error(f"Stock Symbol '{updated_entry['stock_symbol']}' already exists. Please use a unique symbol.")
-                return False
-            except Error as e:
-                st.error(f"Error updating stock entry: {e}")
-                return False
-        else:
-            st.error("Failed to connect to the database.")
-            return False
+    try:
+        conn = get_conn()
+        with get_conn_lock():
+            conn.execute(UPDATE_SQL, (
+                updated_entry['stock_symbol'],
+                updated_entry['total_shares'],
+                updated_entry['buy_price'],
+                updated_entry['risk_ratio'],
+                updated_entry['reward_ratio'],
+                updated_entry['sell_strategy'],
+                updated_entry['sell_price'],
+                stock_id
+            ))
+        _load_stocks.clear()
+        return True
+    except sqlite3.IntegrityError:
+        st.error(f"Stock Symbol '{updated_entry['stock_symbol']}' already exists. Please use a unique symbol.")
+        return False
+    except Error as e:
+        st.error(f"Error updating stock entry: {e}")
+        return False
 
 def delete_stock_entry(stock_id):
     """Delete a stock entry from the database."""
-    with get_db_connection() as conn:
-        if conn is not None:
-            delete_sql = "DELETE FROM stocks WHERE id = ?;"
-            try:
-                conn.execute(delete_sql, (stock_id,))
-                conn.commit()
-                return True
-            except Error as e:
-                st.error(f"Error deleting stock entry: {e}")
-                return False
-        else:
-            st.error("Failed to connect to the database.")
-            return False
-
-# Calculation Function using pandas and numpy
-
-def calculate_metrics(total_shares, buy_price, risk_ratio, reward_ratio, sell_strategy):
-    """Calculate financial metrics based on input parameters."""
-    total_investment = total_shares * buy_price
-    risk_amount = buy_price * (risk_ratio / 100)
-    reward_amount = buy_price * (reward_ratio / 100)
-    stop_loss_price = buy_price - risk_amount
-    take_profit_price = buy_price + reward_amount
-
-    if sell_strategy == "Risk-Based":
-        adjusted_sell_price = stop_loss_price
-    else:
-        adjusted_sell_price = take_profit_price
-
-    return pd.Series({
-        'Total Investment ($)': np.round(total_investment, 2),
-        'Risk Amount ($)': np.round(risk_amount, 2),
-        'Reward Amount ($)': np.round(reward_amount, 2),
-        'Stop-Loss Price ($)': np.round(stop_loss_price, 2),
-        'Take-Profit Price ($)': np.round(take_profit_price, 2),
-        'Adjusted Sell Price ($)': np.round(adjusted_sell_price, 2)
-    })
+    try:
+        conn = get_conn()
+        with get_conn_lock():
+            conn.execute(DELETE_SQL, (stock_id,))
+        _load_stocks.clear()
+        return True
+    except Error as e:
+        st.error(f"Error deleting stock entry: {e}")
+        return False
 
-def plot_comparison_chart(df, metrics, title):
+def read_stock_csv(file):
     """
-    Plot a consolidated bar chart comparing multiple metrics across all stocks.
+    Parse an uploaded CSV file into a list of stock entry dictionaries.
 
-    Parameters:
-    - df: DataFrame containing stock data and metrics.
-    - metrics: List of metrics to compare.
-    - title: Title of the chart.
+    The CSV must have the columns stock_symbol, total_shares, buy_price,
+    risk_ratio, reward_ratio and sell_strategy; sell_price is optional.
     """
+    numeric_columns = ['total_shares', 'buy_price', 'risk_ratio', 'reward_ratio', 'sell_price']
+    # Symbols are text as written: no "0700" -> 700, and the ticker "NA" is not read as missing.
+    # Only an empty numeric cell counts as missing
+    df = pd.read_csv(file, dtype={'stock_symbol': str, 'sell_strategy': str}, keep_default_na=False,
+                     na_values={column: [''] for column in numeric_columns})
+    required_columns = ['stock_symbol', 'total_shares', 'buy_price', 'risk_ratio', 'reward_ratio', 'sell_strategy']
+    missing_columns = [column for column in required_columns if column not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing columns: {', '.join(missing_columns)}")
+    if 'sell_price' not in df.columns:
+        df['sell_price'] = None
+
+    df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric)  # Raises ValueError on bad input
+    if df[numeric_columns[:-1]].isna().any().any():
+        raise ValueError("Only sell_price may be left empty.")
+
+    entries = []
+    for line, row in enumerate(df.itertuples(index=False), start=2):
+        stock_symbol = str(row.stock_symbol).strip().upper() if pd.notna(row.stock_symbol) else ""
+        if not stock_symbol:
+            raise ValueError(f"Line {line}: Stock Symbol cannot be empty.")
+        # isfinite first: int() raises OverflowError on inf
+        if not np.isfinite(row.total_shares) or row.total_shares < 1 or row.total_shares != int(row.total_shares):
+            raise ValueError(f"Line {line}: Total Shares must be a whole number of at least 1.")
+        if row.total_shares > SQLITE_MAX_INTEGER:
+            raise ValueError(f"Line {line}: Total Shares must be at most {SQLITE_MAX_INTEGER}.")
+        if not np.isfinite(row.buy_price):
+            raise ValueError(f"Line {line}: Buy Price must be a finite amount.")
+        if row.buy_price < 0.01:
+            raise ValueError(f"Line {line}: Buy Price must be at least $0.01.")
+        if not 0 <= row.risk_ratio <= 100:
+            raise ValueError(f"Line {line}: Risk Ratio must be between 0 and 100%.")
+        if not 0 <= row.reward_ratio <= 100:
+            raise ValueError(f"Line {line}: Reward Ratio must be between 0 and 100%.")
+        if pd.notna(row.sell_price) and not np.isfinite(row.sell_price):
+            raise ValueError(f"Line {line}: Sell Price must be a finite amount.")
+        if row.sell_strategy not in ("Risk-Based", "Reward-Based"):
+            raise ValueError(f"Line {line}: Sell Strategy must be 'Risk-Based' or 'Reward-Based'.")
+        entries.append({
+            'stock_symbol': stock_symbol,
+            'total_shares': int(row.total_shares),
+            'buy_price': float(row.buy_price),
+            'risk_ratio': float(row.risk_ratio),
+            'reward_ratio': float(row.reward_ratio),
+            'sell_strategy': row.sell_strategy,
+            'sell_price': float(row.sell_price) if pd.notna(row.sell_price) and row.sell_price > 0 else None
+        })
+    return entries
+
+# Chart Functions
+
+def _figure_to_png(fig):
+    """Render a matplotlib figure to PNG bytes and release it."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    plt.close(fig)
+    return buf.getvalue()
+
+@st.cache_data
+def _render_comparison_chart(df, metrics, title):
+    """Draw the comparison chart as PNG bytes; cached on the chart data."""
     x = np.arange(len(df['stock_symbol']))  # Label locations
-    width = 0.2  # Width of each bar
+    width = 0.8 / len(metrics)  # Width of each bar, so a group fills 80% of its slot
+    values = df[list(metrics)].to_numpy()  # One column per metric
+    offsets = (np.arange(len(metrics)) - (len(metrics) - 1) / 2) * width  # Centre each group on its label
 
     fig, ax = plt.subplots(figsize=(12, 7))
 
-    for i, metric in enumerate(metrics):
-        ax.bar(x + i*width - width, df[metric], width, label=metric)
+    for metric, column, offset in zip(metrics, values.T, offsets):
+        ax.bar(x + offset, column, width, label=metric)
 
     ax.set_xlabel('Stock Symbol')
     ax.set_ylabel('Amount ($)')
@@ -206,8 +329,26 @@ def plot_comparison_chart(df, metrics, title):
     ax.set_xticklabels(df['stock_symbol'], rotation=45)
     ax.legend()
 
-    plt.tight_layout()
-    st.pyplot(fig)
+    fig.tight_layout()
+    return _figure_to_png(fig)
+
+def plot_comparison_chart(df, metrics, title):
+    """
+    Plot a consolidated bar chart comparing multiple metrics across all stocks.
+
+    Parameters:
+    - df: DataFrame containing stock data and metrics.
+    - metrics: List of metrics to compare.
+    - title: Title of the chart.
+    """
+    if len(df) < 2:
+        st.info("Add at least two stocks to see a comparison chart.")
+        return
+
+    # Only the plotted columns feed the cache key. Bar heights don't need cent precision,
+    # so the chart copy is float32, halving what is hashed and handed to matplotlib
+    chart_df = df[['stock_symbol', *metrics]].astype({metric: 'float32' for metric in metrics})
+    st.image(_render_comparison_chart(chart_df, tuple(metrics), title))
 
 # Streamlit App Functions
 
@@ -215,29 +356,39 @@ def view_stocks():
     """View all stock entries in a table with comparison charts."""
     st.header("📊 All Stock Entries")
 
-    stocks = get_all_stocks()
+    df = get_all_stocks()
 
-    if not stocks:
+    if df.empty:
         st.info("No stock entries found. Click on 'Add Stock' in the sidebar to create a new entry.")
         return
 
-    # Convert stock data to DataFrame
-    df = pd.DataFrame(stocks)
-
-    # Calculate additional metrics using pandas and numpy
-    metrics_df = df.apply(lambda x: calculate_metrics(
-        x['total_shares'], x['buy_price'], x['risk_ratio'], x['reward_ratio'], x['sell_strategy']
-    ), axis=1)
-
-    # Concatenate original data and calculated metrics
-    combined_df = pd.concat([df, metrics_df], axis=1)
+    # Metrics are computed by the stocks_with_metrics view; only the labels change here.
+    # Indexing on the symbol makes the detail lookup below a hash lookup.
+    combined_df = df.rename(columns=METRIC_COLUMNS).set_index('stock_symbol', drop=False)
+
+    # Display all entries, renaming columns by name so dtypes stay native
+    table_df = combined_df.drop(columns='id').rename(columns={
+        'stock_symbol': 'Stock Symbol',
+        'total_shares': 'Total Shares',
+        'buy_price': 'Buy Price ($)',
+        'risk_ratio': 'Risk Ratio (%)',
+        'reward_ratio': 'Reward Ratio (%)',
+        'sell_strategy': 'Sell Strategy',
+        'sell_price': 'Sell Price ($)'
+    })
+    number_format = st.column_config.NumberColumn(format="%.2f")
+    st.dataframe(table_df, hide_index=True, column_config={
+        column: number_format for column in table_df.select_dtypes('float64').columns
+    })
 
-    # Select a stock based on stock symbol
-    stock_symbols = combined_df['stock_symbol'].tolist()
+    # Select a stock based on stock symbol. Symbols are unique unless init_db could not build
+    # the unique index; then each symbol shows its first row, so .loc always returns one row
+    details_df = combined_df[~combined_df.index.duplicated()]
+    stock_symbols = details_df.index.tolist()
     selected_symbol = st.selectbox("Select a Stock Symbol to View Details", options=stock_symbols)
 
     if selected_symbol:
-        selected_stock = combined_df[combined_df['stock_symbol'] == selected_symbol].iloc[0]
+        selected_stock = details_df.loc[selected_symbol]
 
         # Display inputs first
         st.subheader(f"🔍 Details for {selected_symbol}")
@@ -248,7 +399,7 @@ def view_stocks():
             st.markdown(f"**Risk Ratio (%):** {selected_stock['risk_ratio']:.2f}%")
             st.markdown(f"**Reward Ratio (%):** {selected_stock['reward_ratio']:.2f}%")
             st.markdown(f"**Sell Strategy:** {selected_stock['sell_strategy']}")
-            st.markdown(f"**Sell Price ($):** ${selected_stock['sell_price']:.2f}" if selected_stock['sell_price'] else "N/A")
+            st.markdown(f"**Sell Price ($):** ${selected_stock['sell_price']:.2f}" if pd.notna(selected_stock['sell_price']) else "N/A")
 
         # Display outputs next
         with st.expander("📈 Calculated Metrics"):
@@ -263,13 +414,9 @@ def view_stocks():
         st.subheader("📊 Financial Metrics Chart for Selected Stock")
         metrics = ['Total Investment ($)', 'Risk Amount ($)', 'Reward Amount ($)', 'Stop-Loss Price ($)', 'Take-Profit Price ($)', 'Adjusted Sell Price ($)']
         metric_values = [selected_stock[metric] for metric in metrics]
-
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.barh(metrics, metric_values, color='lightblue')
-        ax.set_xlabel('Amount ($)')
-        ax.set_title(f'Financial Metrics for {selected_symbol}')
-        plt.tight_layout()
-        st.pyplot(fig)
+        # Rendered in the browser, so no matplotlib figure is built for a single stock.
+        # Horizontal bars in the metrics' defined order, as the matplotlib chart drew them
+        st.bar_chart(pd.Series(metric_values, index=metrics, name='Amount ($)'), horizontal=True, sort=False)
 
     # Comparison Chart for All Stocks
     st.subheader("📈 Comparison of Key Metrics Across All Stocks")
@@ -320,22 +467,47 @@ def add_stock():
         else:
             st.error("Failed to add stock entry.")
 
+def import_stocks():
+    """Bulk import stock entries from an uploaded CSV file."""
+    # A page section of its own, so the add form's early returns never hide the uploader
+    st.subheader("📥 Import Stock Entries from CSV")
+    uploaded_file = st.file_uploader(
+        "CSV columns: stock_symbol, total_shares, buy_price, risk_ratio, reward_ratio, sell_strategy, sell_price (optional)",
+        type="csv"
+    )
+    if uploaded_file is not None and st.button("Import Stocks"):
+        try:
+            entries = read_stock_csv(uploaded_file)
+        except (ValueError, pd.errors.ParserError) as e:
+            st.error(f"Error reading CSV: {e}")
+            return
+
+        if not entries:
+            st.info("The uploaded CSV contains no stock entries.")
+            return
+
+        # Insert all rows in one transaction
+        success = add_stock_entries(entries)
+        if success:
+            st.success(f"Imported {len(entries)} stock entries successfully!")
+        else:
+            st.error("Failed to import stock entries.")
+
 def edit_stock():
     """Edit an existing stock entry."""
     st.header("✏️ Edit Existing Stock Entry")
 
-    stocks = get_all_stocks()
+    stock_symbols = get_stock_symbols()
 
-    if not stocks:
+    if not stock_symbols:
         st.info("No stock entries found to edit.")
         return
 
     # Select stock to edit based on stock symbol
-    stock_symbols = [stock['stock_symbol'] for stock in stocks]
     selected_symbol = st.selectbox("Select Stock Symbol to Edit", options=stock_symbols)
 
     if selected_symbol:
-        stock = next((s for s in stocks if s['stock_symbol'] == selected_symbol), None)
+        stock = get_stock_by_symbol(selected_symbol)
 
         if stock:
             with st.form("edit_stock_form"):
@@ -382,18 +554,17 @@ def delete_stock():
     """Delete an existing stock entry."""
     st.header("🗑️ Delete Stock Entry")
 
-    stocks = get_all_stocks()
+    stock_symbols = get_stock_symbols()
 
-    if not stocks:
+    if not stock_symbols:
         st.info("No stock entries found to delete.")
         return
 
     # Select stock to delete based on stock symbol
-    stock_symbols = [stock['stock_symbol'] for stock in stocks]
     selected_symbol = st.selectbox("Select Stock Symbol to Delete", options=stock_symbols)
 
     if selected_symbol:
-        stock = next((s for s in stocks if s['stock_symbol'] == selected_symbol), None)
+        stock = get_stock_by_symbol(selected_symbol)
 
         if stock:
             st.warning(f"Are you sure you want to delete **{stock['stock_symbol']}** with **{stock['total_shares']}** shares?")
@@ -420,6 +591,7 @@ def main():
         view_stocks()
     elif choice == "Add Stock":
         add_stock()
+        import_stocks()
     elif choice == "Edit Stock":
         edit_stock()
     elif choice == "Delete Stock":
@@ -1,23 +1,86 @@
 import streamlit as st
 import json
 import os
+import sys
+import operator
+import functools
+import uuid
+import concurrent.futures
 import pandas as pd
+import numpy as np
+
+try:
+    import orjson  # Faster (de)serialization when available
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # JIT-compiles the metrics kernel when available
+except ImportError:
+    def njit(*args, **kwargs):
+        # Plain NumPy fallback: the kernel runs as ordinary array code
+        return lambda func: func
 
 # Constants
-DATA_FILE = 'stocks.json'
+DATA_FILE = 'stocks.jsonl'  # Append-only JSON Lines log of entries and edit/delete records
+# Pre-log snapshot format, copied into the log once on first read. stock_manager_no_pandas.py
+# still reads and writes this file, so the two apps do not see each other's later changes
+LEGACY_DATA_FILE = 'stocks.json'
+
+# StockEntry fields, in constructor order; also the raw columns of the portfolio DataFrame
+_FIELDS = ('stock_symbol', 'total_shares', 'buy_price', 'risk_ratio',
+           'reward_ratio', 'sell_strategy', 'sell_price', 'entry_id')
+# Values used for fields missing from a stored record
+_DEFAULTS = {'stock_symbol': 'UNKNOWN', 'total_shares': 0, 'buy_price': 0.0, 'risk_ratio': 0.0,
+             'reward_ratio': 0.0, 'sell_strategy': 'Reward-Based', 'sell_price': None, 'entry_id': None}
+_getter = operator.itemgetter(*_FIELDS)
+# Sell strategies as a fixed categorical, so "Risk-Based" is always code 0
+_STRATEGY_DTYPE = pd.CategoricalDtype(['Risk-Based', 'Reward-Based'])
+
+# View table labels and formatting. Streamlit re-executes the script on every rerun, so these
+# are rebuilt each run; that is cheap, and the saving is formatting without a Styler
+_DISPLAY_NAMES = {
+    'stock_symbol': 'Stock Symbol',
+    'total_shares': 'Total Shares',
+    'buy_price': 'Buy Price ($)',
+    'risk_ratio': 'Risk Ratio (%)',
+    'reward_ratio': 'Reward Ratio (%)',
+    'sell_strategy': 'Sell Strategy'
+}
+_NUMERIC_COLS = ('Buy Price ($)', 'Risk Ratio (%)', 'Reward Ratio (%)', 'Total Investment ($)',
+                 'Risk Amount ($)', 'Reward Amount ($)', 'Stop-Loss Price ($)',
+                 'Take-Profit Price ($)', 'Adjusted Sell Price ($)')
+# Formatted client-side in the browser, so the server renders no Styler HTML per cell
+_COLUMN_CONFIG = {col: st.column_config.NumberColumn(format="%.2f") for col in _NUMERIC_COLS}
 
 # Helper Classes and Functions
 
+@st.cache_resource
+def _get_io_pool():
+    # One worker shared by every session, so log reads, appends and compactions run one at a
+    # time in submission order. Cached: a module-level pool would be recreated on every rerun
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+@functools.lru_cache(maxsize=4096)
+def _norm_symbol(symbol):
+    # Tickers repeat across lots, so each is upper-cased once per script run; the memo starts
+    # empty on every rerun, but sys.intern is process-wide, so equal symbols still share a string
+    return sys.intern(symbol.upper())
+
 class StockEntry:
+    # Fixed attributes: no per-instance __dict__ and faster attribute access
+    __slots__ = _FIELDS
+
     def __init__(self, stock_symbol, total_shares, buy_price, risk_ratio,
-                 reward_ratio, sell_strategy, sell_price=None):
-        self.stock_symbol = stock_symbol.upper()
+                 reward_ratio, sell_strategy, sell_price=None, entry_id=None):
+        self.stock_symbol = _norm_symbol(stock_symbol)
         self.total_shares = total_shares
         self.buy_price = buy_price
         self.risk_ratio = risk_ratio
         self.reward_ratio = reward_ratio
         self.sell_strategy = sell_strategy  # "Risk-Based" or "Reward-Based"
         self.sell_price = sell_price  # Optional: Can be calculated
+        self.entry_id = entry_id or uuid.uuid4().hex  # Stable key for edit/delete log records
 
     def to_dict(self):
         return {
@@ -27,100 +90,248 @@ class StockEntry:
             'risk_ratio': self.risk_ratio,
             'reward_ratio': self.reward_ratio,
             'sell_strategy': self.sell_strategy,
-            'sell_price': self.sell_price
+            'sell_price': self.sell_price,
+            'entry_id': self.entry_id
         }
 
-    @staticmethod
-    def from_dict(data):
-        # Provide default values if fields are missing
-        return StockEntry(
-            stock_symbol=data.get('stock_symbol', 'UNKNOWN'),
-            total_shares=data.get('total_shares', 0),
-            buy_price=data.get('buy_price', 0.0),
-            risk_ratio=data.get('risk_ratio', 0.0),
-            reward_ratio=data.get('reward_ratio', 0.0),
-            sell_strategy=data.get('sell_strategy', 'Reward-Based'),
-            sell_price=data.get('sell_price', None)
-        )
-
-    def calculate_metrics(self):
-        total_investment = self.total_shares * self.buy_price
-        risk_amount = self.buy_price * (self.risk_ratio / 100)
-        reward_amount = self.buy_price * (self.reward_ratio / 100)
-        stop_loss_price = self.buy_price - risk_amount
-        take_profit_price = self.buy_price + reward_amount
-
-        if self.sell_strategy == "Risk-Based":
-            adjusted_sell_price = stop_loss_price
-        else:
-            adjusted_sell_price = take_profit_price
-
-        return {
-            'Total Investment ($)': round(total_investment, 2),
-            'Risk Amount ($)': round(risk_amount, 2),
-            'Reward Amount ($)': round(reward_amount, 2),
-            'Stop-Loss Price ($)': round(stop_loss_price, 2),
-            'Take-Profit Price ($)': round(take_profit_price, 2),
-            'Adjusted Sell Price ($)': round(adjusted_sell_price, 2)
-        }
+    @classmethod
+    def from_dict(cls, data):
+        # Complete records unpack in one call; only incomplete ones fall back to defaults
+        try:
+            values = _getter(data)
+        except KeyError:
+            values = tuple(data.get(field, _DEFAULTS[field]) for field in _FIELDS)
+        return cls(*values)
+
+def _dumps(record):
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(',', ':')).encode()
+
+def _loads(data):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _migrate_legacy_file():
+    data = []
+    if os.path.exists(LEGACY_DATA_FILE):
+        with open(LEGACY_DATA_FILE, 'rb') as f:
+            try:
+                data = _loads(f.read())
+            except json.JSONDecodeError:
+                data = []
+    compact(data)
 
 def read_json():
+    # Runs on the I/O thread (see _load_entries), so no append can land between replay and compaction.
+    # Replay the log: plain lines are added entries, '_op' lines edit or delete one by its entry_id.
+    # Ids stay valid however other sessions have reordered the portfolio in the meantime
     if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'w') as f:
-            json.dump([], f)
-    with open(DATA_FILE, 'r') as f:
+        _migrate_legacy_file()
+    data = {}  # entry_id -> entry, in portfolio order
+    line_count = 0
+    missing_ids = False
+    with open(DATA_FILE, 'rb') as f:
+        for line in f:
+            try:
+                record = _loads(line)
+            except json.JSONDecodeError:
+                continue  # Blank or partially written line
+            line_count += 1
+            op = record.get('_op')
+            if op is None:
+                if record.get('entry_id') is None:
+                    # Migrated or older entries: derive the id from the line, so every session
+                    # replaying this file assigns the same one until compaction stores it
+                    record['entry_id'] = f"line-{line_count}"
+                    missing_ids = True
+                data[record['entry_id']] = record
+                continue
+            entry_id = record.get('id')
+            if entry_id is None and 0 <= record.get('idx', -1) < len(data):
+                entry_id = list(data)[record['idx']]  # Positional record from before entries had ids
+            if entry_id not in data:
+                continue  # Already deleted, e.g. by another session
+            if op == 'upd':
+                data[entry_id] = dict(record['entry'], entry_id=entry_id)
+            elif op == 'del':
+                del data[entry_id]
+    data = list(data.values())
+    if missing_ids or line_count > 2 * len(data):
         try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            data = []
+            compact(data)
+        except OSError:
+            pass  # Only an optimization: the uncompacted log replays to the same entries and ids
     return data
 
-def write_json(data):
+def _replace_log(chunks):
+    # The new log goes to a temp file first, so a crash mid-write never truncates it
+    tmp = DATA_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, DATA_FILE)
+
+def _append_log(records):
+    # Runs on the I/O thread, so errors are raised to the caller rather than shown with st.error.
+    # The batch lands whole or not at all: after a partial write the file is cut back to where
+    # it started, so re-queuing the batch can't apply any of its records twice
+    payload = b''.join(_dumps(record) + b'\n' for record in records)
+    fd = os.open(DATA_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
-        return True
-    except Exception as e:
-        st.error(f"Error writing to JSON: {e}")
-        return False
+        start = os.fstat(fd).st_size
+        try:
+            written = 0
+            while written < len(payload):
+                written += os.write(fd, payload[written:])
+        except OSError:
+            os.ftruncate(fd, start)
+            raise
+    finally:
+        os.close(fd)
+    # A write within the filesystem's mtime resolution would otherwise hit the stale entry
+    _load_entries.clear()
+
+def compact(data):
+    # Rewrite the log as a snapshot holding one line per live entry
+    return _replace_log(_dumps(record) + b'\n' for record in data)
+
+@st.cache_data
+def _load_entries(mtime):
+    # Cached per file modification time, so unchanged files skip the parse
+    return [StockEntry.from_dict(entry) for entry in _get_io_pool().submit(read_json).result()]
 
 def get_stock_entries():
-    data = read_json()
-    return [StockEntry.from_dict(entry) for entry in data]
-
-def save_stock_entries(entries):
-    data = [entry.to_dict() for entry in entries]
-    return write_json(data)
-
-def add_stock_entry(entry, entries):
-    entries.append(entry)
-    return save_stock_entries(entries)
-
-def update_stock_entry(index, updated_entry, entries):
-    if 0 <= index < len(entries):
-        entries[index] = updated_entry
-        return save_stock_entries(entries)
+    mtime = os.path.getmtime(DATA_FILE) if os.path.exists(DATA_FILE) else 0.0
+    return _load_entries(mtime)
+
+@njit(cache=True, fastmath=True)
+def _metrics(shares, bp, rr, wr, is_risk):
+    inv = shares * bp
+    ra = bp * rr / 100.0
+    wa = bp * wr / 100.0
+    sl = bp - ra
+    tp = bp + wa
+    adj = np.where(is_risk, sl, tp)
+    return inv, ra, wa, sl, tp, adj
+
+def _add_metrics(df):
+    # Compute all metric columns at once, in place
+    (df['Total Investment ($)'], df['Risk Amount ($)'], df['Reward Amount ($)'],
+     df['Stop-Loss Price ($)'], df['Take-Profit Price ($)'], df['Adjusted Sell Price ($)']) = _metrics(
+        df['total_shares'].to_numpy(dtype=np.float64),
+        df['buy_price'].to_numpy(dtype=np.float64),
+        df['risk_ratio'].to_numpy(dtype=np.float64),
+        df['reward_ratio'].to_numpy(dtype=np.float64),
+        df['sell_strategy'].cat.codes.to_numpy() == 0
+    )
+    return df
+
+def _entries_to_df(entries):
+    df = pd.DataFrame([entry.to_dict() for entry in entries], columns=list(_FIELDS))
+    # Fixed dtypes, so an empty portfolio or one with no sell prices still concatenates cleanly.
+    # The repeated string columns are categoricals: one copy of each value plus small integer codes
+    df = df.astype({'stock_symbol': 'category', 'total_shares': 'int64', 'buy_price': 'float64',
+                    'risk_ratio': 'float64', 'reward_ratio': 'float64', 'sell_strategy': _STRATEGY_DTYPE,
+                    'sell_price': 'float64'})
+    return _add_metrics(df)
+
+def _concat_portfolio(frames):
+    # Symbol categories differ between frames, which concat widens to object; restore the categorical
+    return pd.concat(frames, ignore_index=True).astype({'stock_symbol': 'category'})
+
+def _df_to_entries(df):
+    # Box values back to plain Python (NaN -> None) so they serialize and fill widgets
+    raw = df[list(_FIELDS)].astype(object)
+    records = raw.where(raw.notna(), None).to_dict('records')
+    return [StockEntry.from_dict(record) for record in records]
+
+def _queue_records(records):
+    # Edits are held in the session until saved, so K edits cost one write instead of K
+    st.session_state.pending_records.extend(records)
+
+def _check_save(wait=False):
+    # Collect the background save, putting its records back in the queue if it failed
+    job = st.session_state.get('save_job')
+    if job is None or not (wait or job[0].done()):
+        return
+    future, records = job
+    st.session_state.save_job = None
+    error = future.exception()
+    if error is not None:
+        st.error(f"Error writing to JSON: {error}")
+        st.session_state.pending_records[:0] = records  # Ahead of anything queued since
+
+def flush_pending():
+    # Hands the write to the I/O thread so the page can rerender while it completes
+    _check_save(wait=True)
+    pending = st.session_state.pending_records
+    if pending:
+        st.session_state.pending_records = []
+        st.session_state.save_job = (_get_io_pool().submit(_append_log, pending), pending)
+
+def add_stock_entry(entry, df):
+    # Returns the updated portfolio DataFrame; update and delete return None for a bad index instead
+    _queue_records([entry.to_dict()])
+    return _concat_portfolio([df, _entries_to_df([entry])])
+
+def update_stock_entry(index, updated_entry, df):
+    if 0 <= index < len(df):
+        updated_entry.entry_id = df['entry_id'].iat[index]  # The edit keeps the row's identity
+        _queue_records([{'_op': 'upd', 'id': updated_entry.entry_id, 'entry': updated_entry.to_dict()}])
+        return _concat_portfolio([df.iloc[:index], _entries_to_df([updated_entry]), df.iloc[index + 1:]])
     else:
         st.error("Invalid stock entry index.")
-        return False
+        return None
 
-def delete_stock_entry(index, entries):
-    if 0 <= index < len(entries):
-        del entries[index]
-        return save_stock_entries(entries)
+def delete_stock_entry(index, df):
+    if 0 <= index < len(df):
+        _queue_records([{'_op': 'del', 'id': df['entry_id'].iat[index]}])
+        return df.drop(index=index).reset_index(drop=True)
     else:
         st.error("Invalid stock entry index.")
-        return False
+        return None
 
 # Streamlit App
 
+def _set_portfolio(df):
+    st.session_state.df = df
+    st.session_state.stock_options = None  # Labels are rebuilt lazily for the new frame
+    st.session_state.view_df = None  # Likewise the renamed table shown by view_stocks
+
+def _stock_options():
+    # Selectbox labels, built once per portfolio change rather than on every rerun
+    if st.session_state.get('stock_options') is None:
+        df = st.session_state.df
+        st.session_state.stock_options = [f"{i+1}. {symbol} - {shares} shares"
+                                          for i, (symbol, shares) in enumerate(zip(df['stock_symbol'], df['total_shares']))]
+    return st.session_state.stock_options
+
+def _view_df():
+    # Display copy of the portfolio, rebuilt only after it changes rather than on every rerun
+    if st.session_state.get('view_df') is None:
+        st.session_state.view_df = st.session_state.df.drop(columns=['sell_price', 'entry_id']).rename(columns=_DISPLAY_NAMES)
+    return st.session_state.view_df
+
 def main():
     st.set_page_config(page_title="Stock Trading Manager", layout="wide")
     st.title("📈 Stock Trading Manager")
 
-    # Initialize session state
-    if 'entries' not in st.session_state:
-        st.session_state.entries = get_stock_entries()
+    # Initialize session state; the portfolio is kept as one DataFrame with metrics precomputed
+    if 'df' not in st.session_state:
+        _set_portfolio(_entries_to_df(get_stock_entries()))
+    if 'pending_records' not in st.session_state:
+        st.session_state.pending_records = []  # Log records not yet written to disk
+    _check_save()
+
+    # Written only by stock_manager_no_pandas.py once migrated, so a newer file means the apps diverged
+    if os.path.exists(LEGACY_DATA_FILE) and os.path.exists(DATA_FILE) \
+            and os.path.getmtime(LEGACY_DATA_FILE) > os.path.getmtime(DATA_FILE):
+        st.sidebar.warning(f"{LEGACY_DATA_FILE} changed after {DATA_FILE} was last written. "
+                           "Changes made in the list-based manager are not shown here.")
 
     # Sidebar Navigation
     st.sidebar.title("Navigation")
@@ -135,44 +346,21 @@ def main():
     elif app_mode == "Delete Stock":
         delete_stock()
 
+    # Rendered after the page, so changes made in this run are already counted
+    pending = len(st.session_state.pending_records)
+    if pending:
+        st.sidebar.warning("Unsaved changes are kept only in this browser session "
+                           "and are lost if it ends before you save.")
+        st.sidebar.button(f"💾 Save ({pending} unsaved change{'s' if pending > 1 else ''})", on_click=flush_pending)
+
 def view_stocks():
     st.header("📊 All Stock Entries")
 
-    if not st.session_state.entries:
+    if st.session_state.df.empty:
         st.info("No stock entries found. Click on 'Add Stock' in the sidebar to create a new entry.")
         return
 
-    # Prepare DataFrame
-    data = []
-    for entry in st.session_state.entries:
-        metrics = entry.calculate_metrics()
-        data.append({
-            'Stock Symbol': entry.stock_symbol,
-            'Total Shares': entry.total_shares,
-            'Buy Price ($)': entry.buy_price,
-            'Risk Ratio (%)': entry.risk_ratio,
-            'Reward Ratio (%)': entry.reward_ratio,
-            'Sell Strategy': entry.sell_strategy,
-            'Total Investment ($)': metrics['Total Investment ($)'],
-            'Risk Amount ($)': metrics['Risk Amount ($)'],
-            'Reward Amount ($)': metrics['Reward Amount ($)'],
-            'Stop-Loss Price ($)': metrics['Stop-Loss Price ($)'],
-            'Take-Profit Price ($)': metrics['Take-Profit Price ($)'],
-            'Adjusted Sell Price ($)': metrics['Adjusted Sell Price ($)']
-        })
-
-    df = pd.DataFrame(data)
-    st.dataframe(df.style.format({
-        'Buy Price ($)': "{:.2f}",
-        'Risk Ratio (%)': "{:.2f}",
-        'Reward Ratio (%)': "{:.2f}",
-        'Total Investment ($)': "{:.2f}",
-        'Risk Amount ($)': "{:.2f}",
-        'Reward Amount ($)': "{:.2f}",
-        'Stop-Loss Price ($)': "{:.2f}",
-        'Take-Profit Price ($)': "{:.2f}",
-        'Adjusted Sell Price ($)': "{:.2f}"
-    }), height=600)
+    st.dataframe(_view_df(), column_config=_COLUMN_CONFIG, height=600)
 
 def add_stock():
     st.header("➕ Add New Stock Entry")
@@ -207,28 +395,24 @@ def add_stock():
             sell_price=sell_price_value
         )
 
-        success = add_stock_entry(new_entry, st.session_state.entries)
-        if success:
-            st.success("Stock entry added successfully!")
-            st.session_state.entries = get_stock_entries()
-        else:
-            st.error("Failed to add stock entry.")
+        _set_portfolio(add_stock_entry(new_entry, st.session_state.df))
+        st.success("Stock entry added successfully!")
 
 def edit_stock():
     st.header("✏️ Edit Existing Stock Entry")
 
-    if not st.session_state.entries:
+    if st.session_state.df.empty:
         st.info("No stock entries found to edit.")
         return
 
     # Select stock to edit
-    stock_options = [f"{i+1}. {entry.stock_symbol} - {entry.total_shares} shares" 
-                    for i, entry in enumerate(st.session_state.entries)]
-    selected_stock = st.selectbox("Select Stock to Edit", options=stock_options)
+    # Options are row positions, so the selection is already the index we need
+    df = st.session_state.df
+    stock_options = _stock_options()
+    index = st.selectbox("Select Stock to Edit", options=range(len(stock_options)), format_func=stock_options.__getitem__)
 
-    if selected_stock:
-        index = stock_options.index(selected_stock)
-        entry = st.session_state.entries[index]
+    if index is not None:
+        entry = _df_to_entries(df.iloc[[index]])[0]
 
         with st.form("edit_stock_form"):
             stock_symbol = st.text_input("Stock Symbol", entry.stock_symbol).upper()
@@ -260,36 +444,37 @@ def edit_stock():
                 sell_price=sell_price_value
             )
 
-            success = update_stock_entry(index, updated_entry, st.session_state.entries)
-            if success:
+            df = update_stock_entry(index, updated_entry, df)
+            if df is not None:
+                _set_portfolio(df)
                 st.success("Stock entry updated successfully!")
-                st.session_state.entries = get_stock_entries()
             else:
                 st.error("Failed to update stock entry.")
 
 def delete_stock():
     st.header("🗑️ Delete Stock Entry")
 
-    if not st.session_state.entries:
+    if st.session_state.df.empty:
         st.info("No stock entries found to delete.")
         return
 
     # Select stock to delete
-    stock_options = [f"{i+1}. {entry.stock_symbol} - {entry.total_shares} shares" 
-                    for i, entry in enumerate(st.session_state.entries)]
-    selected_stock = st.selectbox("Select Stock to Delete", options=stock_options)
+    # Options are row positions, so the selection is already the index we need
+    df = st.session_state.df
+    stock_options = _stock_options()
+    index = st.selectbox("Select Stock to Delete", options=range(len(stock_options)), format_func=stock_options.__getitem__)
 
-    if selected_stock:
-        index = stock_options.index(selected_stock)
-        entry = st.session_state.entries[index]
+    if index is not None:
+        entry = _df_to_entries(df.iloc[[index]])[0]
         st.warning(f"Are you sure you want to delete **{entry.stock_symbol}** with **{entry.total_shares}** shares?")
 
         if st.button("Delete Stock"):
-            success = delete_stock_entry(index, st.session_state.entries)
-            if success:
+            df = delete_stock_entry(index, df)
+            if df is not None:
+                _set_portfolio(df)
                 st.success("Stock entry deleted successfully!")
-                st.session_state.entries = get_stock_entries()
-                st.experimental_rerun()
+                # The selectbox above still lists the deleted row; repaint from the new frame
+                st.rerun()
             else:
                 st.error("Failed to delete stock entry.")
 